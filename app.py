@@ -15,23 +15,35 @@ Uso desde los agentes:
   import requests
   resp = requests.post(BROWSER_SERVICE_URL + "/browse", json={"url": "https://..."}, headers={"X-API-Key": KEY})
   data = resp.json()
-  screenshot_b64 = data["screenshot"]   # base64 PNG
+  screenshot_b64 = data["screenshot"]   # base64 JPEG (img_format="png" for PNG)
   text_content   = data["text"]         # texto limpio de la página
 """
 
 import asyncio
-import base64
 import logging
+import multiprocessing
 import os
 import time
 import re
+import uuid
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Literal, Optional
+from urllib.parse import quote
 
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+
+try:
+    from pybase64 import b64encode as _b64encode   # SIMD encoder
+except ImportError:  # Fallback: stdlib encoder
+    from base64 import b64encode as _b64encode
 
 # ── Logging ────────────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -43,23 +55,106 @@ log = logging.getLogger("BrowserService")
 # ── Config ─────────────────────────────────────────────────────────────────────
 API_KEY = os.environ.get("BROWSER_SERVICE_API_KEY", "terrachat-browser-2026")
 PORT    = int(os.environ.get("PORT", 8080))
+POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", 4))   # Warm pages kept ready
+CACHE_TTL = int(os.environ.get("BROWSE_CACHE_TTL", 120))  # Seconds a result is reused
+CACHE_MAX_BYTES = int(os.environ.get("BROWSE_CACHE_MAX_MB", 256)) * 1024 * 1024  # Cache memory cap
+SLOT_MAX_USES = int(os.environ.get("BROWSER_SLOT_MAX_USES", 200))  # Recycle a page after N requests
+COOKIE_RESET_S = int(os.environ.get("BROWSER_COOKIE_RESET_S", 600))  # Clear shared cookies every N s
+CPU_WORKERS = int(os.environ.get("CPU_WORKERS", 2))  # Processes for CPU-heavy cleanup
+CPU_OFFLOAD_CHARS = 256 * 1024   # HTML longer than this (chars) is cleaned in _cpu_pool
+# Static DNS for known targets: "host=ip,host2=ip2" → --host-resolver-rules
+DNS_MAP = os.environ.get("BROWSER_DNS_MAP", "")
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+VIEWPORT   = {"width": 1280, "height": 800}
+
+TEXT_LIMIT  = 8000   # Max chars of page text returned by action=read
+TEXT_MARGIN = 1024   # Extra chars fetched so whitespace cleanup still leaves TEXT_LIMIT
+# Slice innerText inside the page so only the needed chars cross the CDP pipe.
+_BODY_TEXT_JS = "(n) => { const t = document.body.innerText; return t.length > n ? t.slice(0, n) : t; }"
+
+# Resource types aborted by default for text-only fetches. Routing disables
+# Playwright's HTTP cache and sends every subresource through a Python
+# handler, so screenshots install no route unless block_resources asks.
+TEXT_ONLY_BLOCK  = ["image", "font", "media", "stylesheet"]
+# Playwright's request.resource_type values
+ResourceType = Literal[
+    "document", "stylesheet", "image", "media", "font", "script", "texttrack",
+    "xhr", "fetch", "eventsource", "websocket", "manifest", "other",
+]
+
+# Text cleanup patterns (compiled once)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE  = re.compile(r'\s+')
+_NL_RE  = re.compile(r'\n{3,}')
 
 # ── State ──────────────────────────────────────────────────────────────────────
 _playwright = None
 _browser    = None
-_stats = {
-    "requests_total": 0,
-    "requests_ok": 0,
-    "requests_error": 0,
-    "started_at": time.time(),
-}
+_context    = None   # Single long-lived context shared by every page
+_browser_ready = False   # Cached connection state, kept fresh by _heartbeat()
+_cpu_pool: Optional[ProcessPoolExecutor] = None   # Started in lifespan
+# Serializes launch/close so concurrent callers never start two Chromiums
+_launch_lock = asyncio.Lock()
+# Pool of warm (page, uses) slots in _context. A None slot means "create on
+# next use". The shared context keeps DNS/TLS sessions and V8 code caches
+# warm across requests (the HTTP cache too, for requests that install no
+# resource-blocking route); pages are recycled after SLOT_MAX_USES requests
+# to bound memory. The queue size caps concurrency: overflow requests wait for a free
+# slot instead of opening extra pages.
+_page_pool: asyncio.Queue = asyncio.Queue()
+for _ in range(POOL_SIZE):
+    _page_pool.put_nowait(None)
+# Pages owned by the pool. Any other page in _context was opened by a site
+# (window.open, target=_blank, popups) and is closed on the next release.
+_pool_pages: set = set()
+_pages_creating = 0   # new_page() calls in flight; their pages aren't in _pool_pages yet
+# Recent results for hot URLs, plus a single-flight map of in-progress fetches
+# so concurrent duplicate requests share one browser fetch.
+def _cache_size(result: dict) -> int:
+    """Approximate memory held by a cached result (screenshot bytes dominate)."""
+    return 1024 + len(result.get("screenshot") or b"") + len(result.get("text", ""))
+
+
+_cache: TTLCache = TTLCache(maxsize=CACHE_MAX_BYTES, ttl=CACHE_TTL, getsizeof=_cache_size)
+_inflight: dict[tuple, asyncio.Future] = {}
+# Request counters live in a flat unsigned array indexed by position
+# (cheaper than dict stores); /status turns them back into named fields.
+_STAT_NAMES = ("requests_total", "requests_ok", "requests_error", "cache_hits")
+_TOTAL, _OK, _ERROR, _CACHE_HITS = range(len(_STAT_NAMES))
+_stats = array("Q", [0] * len(_STAT_NAMES))
+_started_at = time.time()
+
+
+def _host_resolver_args() -> list:
+    """Translate BROWSER_DNS_MAP into Chromium's --host-resolver-rules flag."""
+    rules = []
+    for pair in DNS_MAP.split(","):
+        host, sep, ip = pair.strip().partition("=")
+        if sep and host and ip:
+            rules.append(f"MAP {host.strip()} {ip.strip()}")
+    return [f"--host-resolver-rules={', '.join(rules)}"] if rules else []
+
+
+def _browser_alive() -> bool:
+    return _browser is not None and _browser.is_connected() and _context is not None
 
 
 async def _ensure_browser():
-    """Launch browser if not already running."""
-    global _playwright, _browser
-    if _browser and _browser.is_connected():
+    """Launch browser (and its shared context) if not already running."""
+    if _browser_alive():
         return _browser
+    async with _launch_lock:
+        # Another caller may have finished launching while we waited
+        if _browser_alive():
+            return _browser
+        # Tear down leftovers of a crashed browser before relaunching
+        await _shutdown_browser()
+        return await _launch_browser()
+
+
+async def _launch_browser():
+    global _playwright, _browser, _context, _browser_ready
     log.info("🚀 Launching Chromium...")
     from playwright.async_api import async_playwright
     _playwright = await async_playwright().start()
@@ -78,14 +173,25 @@ async def _ensure_browser():
             "--no-first-run",
             "--safebrowsing-disable-auto-update",
             "--window-size=1280,800",
+            *_host_resolver_args(),
         ]
     )
+    _context = await _browser.new_context(user_agent=USER_AGENT, viewport=VIEWPORT)
+    _browser_ready = True
     log.info("✅ Chromium launched")
     return _browser
 
 
 async def _close_browser():
-    global _playwright, _browser
+    async with _launch_lock:
+        await _shutdown_browser()
+
+
+async def _shutdown_browser():
+    global _playwright, _browser, _context, _browser_ready
+    _browser_ready = False
+    _context = None
+    _pool_pages.clear()
     if _browser:
         try:
             await _browser.close()
@@ -100,21 +206,202 @@ async def _close_browser():
         _playwright = None
 
 
+async def _acquire_page(context):
+    """Take a (page, uses) slot from the pool, (re)creating it if empty, stale or closed."""
+    global _pages_creating
+    slot = await _page_pool.get()
+    if slot is not None and slot[0].context is context and not slot[0].is_closed():
+        return slot
+    if slot is not None:
+        _pool_pages.discard(slot[0])
+    _pages_creating += 1
+    try:
+        page = await context.new_page()
+        _pool_pages.add(page)
+    except BaseException:
+        # Includes CancelledError — the slot must go back or the pool shrinks
+        _page_pool.put_nowait(None)
+        raise
+    finally:
+        _pages_creating -= 1
+    return page, 0
+
+
+async def _close_stray_pages(context):
+    """Close pages a site opened on its own (popups, target=_blank, ...)."""
+    if _pages_creating:
+        return   # Can't tell a half-created pool page from a popup; retry next release
+    for page in [p for p in context.pages if p not in _pool_pages]:
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+
+async def _release_page(slot, healthy: bool = True):
+    """Reset a slot and return it to the pool; broken or worn-out pages are closed."""
+    page, uses = slot
+    uses += 1
+    healthy = healthy and uses < SLOT_MAX_USES
+    await _close_stray_pages(page.context)
+    if healthy:
+        try:
+            await page.unroute("**/*")
+            await page.goto("about:blank")
+        except Exception:
+            healthy = False
+        slot = (page, uses)
+    if not healthy:
+        _pool_pages.discard(page)
+        try:
+            await page.close()
+        except Exception:
+            pass
+        slot = None
+    _page_pool.put_nowait(slot)
+
+
+async def _warm_up():
+    """Launch the browser and pre-create every pool slot."""
+    slots = []
+    try:
+        await _ensure_browser()
+        for _ in range(POOL_SIZE):
+            slots.append(await _acquire_page(_context))
+    except Exception as e:
+        # Not fatal: empty slots are created lazily by _acquire_page()
+        log.error(f"Page pool warm-up failed: {e}")
+    finally:
+        for slot in slots:
+            _page_pool.put_nowait(slot)
+    log.info(f"✅ Page pool warmed ({len(slots)} pages)")
+
+
+async def _reset_cookies(interval: float = COOKIE_RESET_S):
+    """Periodically clear cookies in the shared context."""
+    while True:
+        await asyncio.sleep(interval)
+        if _context is not None:
+            try:
+                await _context.clear_cookies()
+            except Exception as e:
+                log.warning(f"Cookie reset failed: {e}")
+
+
+async def _heartbeat(interval: float = 5.0):
+    """Refresh _browser_ready periodically so probes never query the browser."""
+    global _browser_ready
+    while True:
+        _browser_ready = _browser_alive()
+        await asyncio.sleep(interval)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Start browser in background on startup so /healthz responds immediately."""
-    # Launch browser in background — don't block startup
-    asyncio.create_task(_ensure_browser())
+    """Launch the browser on startup, then warm the page pool in background."""
+    global _cpu_pool
+    # forkserver: workers must not fork from a process holding Playwright
+    # driver pipes and live threadpool threads
+    _cpu_pool = ProcessPoolExecutor(
+        max_workers=CPU_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver"),
+    )
+    try:
+        await _ensure_browser()
+    except Exception as e:
+        # Keep serving: requests retry the launch via _ensure_browser()
+        log.error(f"Browser launch failed at startup: {e}")
+    warm_up = asyncio.create_task(_warm_up())
+    heartbeat = asyncio.create_task(_heartbeat())
+    cookie_reset = asyncio.create_task(_reset_cookies())
     yield
+    warm_up.cancel()
+    heartbeat.cancel()
+    cookie_reset.cancel()
+    _cpu_pool.shutdown(wait=False)
     await _close_browser()
 
 
+# ── Compression ────────────────────────────────────────────────────────────────
+class BinaryAwareGZip:
+    """Gzip ASGI middleware that skips responses that won't shrink.
+
+    Like Starlette's GZipMiddleware, but the decision is made per response
+    from its Content-Type: image/* and multipart/* (raw JPEG/PNG) and bodies
+    that already carry a Content-Encoding are passed through untouched.
+    """
+
+    SKIP_TYPES = (b"image/", b"multipart/")
+
+    def __init__(self, app, minimum_size: int = 500, compresslevel: int = 9):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not any(
+            name == b"accept-encoding" and b"gzip" in value
+            for name, value in scope["headers"]
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        start = None          # Held back until we know whether to compress
+        passthrough = False
+        compressor = None
+
+        async def send_gzip(message):
+            nonlocal start, passthrough, compressor
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers", []))
+                passthrough = (
+                    b"content-encoding" in headers
+                    or headers.get(b"content-type", b"").startswith(self.SKIP_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 31)   # 31 = gzip wrapper
+                headers = [
+                    (name, value) for name, value in start.get("headers", [])
+                    if name not in (b"content-length", b"vary")
+                ]
+                vary = dict(start.get("headers", [])).get(b"vary")
+                headers += [
+                    (b"content-encoding", b"gzip"),
+                    (b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"),
+                ]
+                await send({**start, "headers": headers})
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.flush()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_gzip)
+
+
 # ── App ────────────────────────────────────────────────────────────────────────
 app = FastAPI(
     title="TerraChat Browser Service",
     description="Centralized browser service for TerraChat AI agents",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -123,6 +410,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# base64 screenshots and page text compress well; level 4 keeps CPU cheap
+app.add_middleware(BinaryAwareGZip, minimum_size=1024, compresslevel=4)
 
 
 # ── Models ─────────────────────────────────────────────────────────────────────
@@ -135,6 +424,13 @@ class BrowseRequest(BaseModel):
     timeout_ms: int = 20000        # Navigation timeout (ms)
     full_page: bool = False        # Full page screenshot or viewport only
     save_to_agent: Optional[str] = None  # If set, agent_id to save screenshot for
+    response_format: Literal["base64", "binary"] = "base64"  # JSON | raw image / multipart
+    img_format: Literal["jpeg", "png"] = "jpeg"    # Screenshot encoding
+    img_quality: int = Field(80, ge=0, le=100)    # JPEG quality (ignored for png)
+    no_cache: bool = False         # Skip the result cache and fetch fresh
+    block_resources: Optional[list[ResourceType]] = None  # Resource types to abort (None = endpoint default)
+    # goto load state; None = "commit" for screenshot, else "domcontentloaded"
+    wait_until: Optional[Literal["load", "domcontentloaded", "networkidle", "commit"]] = None
 
 
 # ── Auth helper ────────────────────────────────────────────────────────────────
@@ -144,30 +440,120 @@ def _check_auth(x_api_key: Optional[str]):
 
 
 # ── Core browse logic ──────────────────────────────────────────────────────────
-async def _browse(req: BrowseRequest) -> dict:
-    """Core browsing logic. Returns dict with text, screenshot, title, url."""
+def _clean_text(raw: str, is_html: bool = False) -> str:
+    """Collapse blank lines; with is_html, strip tags and whitespace first."""
+    if is_html:
+        raw = _TAG_RE.sub(' ', raw)
+        raw = _WS_RE.sub(' ', raw)
+    return _NL_RE.sub('\n\n', raw).strip()
+
+
+async def _take_screenshot(page, req: BrowseRequest) -> bytes:
+    return await page.screenshot(
+        full_page=req.full_page,
+        type=req.img_format,
+        quality=req.img_quality if req.img_format == "jpeg" else None,
+    )
+
+
+async def _browse(req: BrowseRequest, *, want_shot: bool, want_text: bool) -> dict:
+    """Cached front for _browse_page (only for side-effect free actions)."""
+    if req.action not in ("read", "screenshot"):
+        result, _ = await _browse_page(req, want_shot=want_shot, want_text=want_text)
+        return result
+
+    # Image options only matter when a screenshot is taken
+    shot_opts = (req.full_page, req.img_format, req.img_quality) if want_shot else None
+    key = (req.url, req.action, want_shot, want_text, shot_opts, req.wait_ms, req.wait_until,
+           None if req.block_resources is None else tuple(sorted(req.block_resources)))
+    result = None if req.no_cache else _cache.get(key)
+    if result is not None:
+        # Served without the browser; still a request as far as /status goes
+        _stats[_TOTAL] += 1
+        _stats[_OK] += 1
+        _stats[_CACHE_HITS] += 1
+    elif key in _inflight:
+        # Same fetch already running — wait for it. shield() keeps a
+        # cancelled follower from cancelling the shared future.
+        _stats[_TOTAL] += 1
+        try:
+            result = await asyncio.shield(_inflight[key])
+        except Exception:
+            _stats[_ERROR] += 1
+            raise
+        _stats[_OK] += 1
+    else:
+        fut = asyncio.get_running_loop().create_future()
+        _inflight[key] = fut
+        try:
+            result, navigated = await _browse_page(req, want_shot=want_shot, want_text=want_text)
+            # Never cache a failed/partial navigation — it would pin a blank
+            # or error page for every caller for CACHE_TTL seconds.
+            if navigated and _cache_size(result) <= CACHE_MAX_BYTES:
+                _cache[key] = result
+            fut.set_result(result)
+        except asyncio.CancelledError:
+            # The leader was cancelled (e.g. shutdown) but followers weren't —
+            # give them a proper error response instead of a CancelledError.
+            fut.set_exception(HTTPException(status_code=503, detail="Browse was cancelled, retry"))
+            fut.exception()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()   # Mark retrieved in case nobody else was waiting
+            raise
+        finally:
+            del _inflight[key]
+    # Callers may mutate the dict (e.g. multipart pops the screenshot)
+    return dict(result)
+
+
+async def _browse_page(req: BrowseRequest, *, want_shot: bool, want_text: bool) -> tuple[dict, bool]:
+    """Core browsing logic. Returns (result, navigated): a dict with title, url
+    and only the screenshot / text parts the caller asked for, plus whether
+    page.goto completed without error."""
     global _browser
-    _stats["requests_total"] += 1
+    _stats[_TOTAL] += 1
 
     # Ensure browser is alive (auto-restart if crashed)
     try:
-        browser = await _ensure_browser()
+        await _ensure_browser()
     except Exception as e:
-        _stats["requests_error"] += 1
+        _stats[_ERROR] += 1
         raise HTTPException(status_code=503, detail=f"Browser unavailable: {e}")
 
-    page = None
     try:
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            viewport={"width": 1280, "height": 800},
-        )
-        page = await context.new_page()
+        slot = await _acquire_page(_context)
+    except Exception as e:
+        _stats[_ERROR] += 1
+        log.error(f"Browse error for {req.url}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    page, _ = slot
+    healthy = True
+    try:
+        # Skip loading resources the response doesn't need
+        if req.block_resources is not None:
+            blocked = set(req.block_resources)
+        else:
+            blocked = set() if want_shot else set(TEXT_ONLY_BLOCK)
+        if blocked:
+            async def _filter(route):
+                if route.request.resource_type in blocked:
+                    await route.abort()
+                else:
+                    await route.continue_()
+            await page.route("**/*", _filter)
 
         # Navigate
+        navigated = True
         try:
-            await page.goto(req.url, wait_until="domcontentloaded", timeout=req.timeout_ms)
+            # Screenshots only need the response committed plus wait_ms;
+            # text extraction waits for the parser to finish.
+            wait_until = req.wait_until or ("commit" if req.action == "screenshot" else "domcontentloaded")
+            await page.goto(req.url, wait_until=wait_until, timeout=req.timeout_ms)
         except Exception as nav_err:
+            navigated = False
             log.warning(f"Navigation warning for {req.url}: {nav_err}")
             # Continue anyway — partial loads are often fine
 
@@ -175,28 +561,43 @@ async def _browse(req: BrowseRequest) -> dict:
         if req.wait_ms > 0:
             await page.wait_for_timeout(req.wait_ms)
 
-        title = await page.title()
+        # Title, screenshot and text are independent CDP calls on the loaded
+        # page — run them concurrently, then retry any failed one on its own.
+        title, screenshot_bytes, text = await asyncio.gather(
+            page.title(),
+            _take_screenshot(page, req) if want_shot else asyncio.sleep(0),
+            page.evaluate(_BODY_TEXT_JS, TEXT_LIMIT + TEXT_MARGIN) if want_text else asyncio.sleep(0),
+            return_exceptions=True,
+        )
+        if isinstance(title, Exception):
+            title = await page.title()
+        if isinstance(screenshot_bytes, Exception):
+            screenshot_bytes = await _take_screenshot(page, req)
+
         result = {
             "url": req.url,
             "title": title,
             "action": req.action,
         }
 
-        # Screenshot (always taken for browse/screenshot actions)
-        if req.action in ("screenshot", "read", "click", "fill"):
-            screenshot_bytes = await page.screenshot(full_page=req.full_page)
-            result["screenshot"] = base64.b64encode(screenshot_bytes).decode("ascii")
+        # Screenshot — kept raw; base64 (if any) is streamed by the response
+        if want_shot:
+            result["screenshot"] = screenshot_bytes
 
         # Text extraction
-        if req.action in ("read",):
-            try:
-                text = await page.inner_text("body")
-            except Exception:
+        if want_text:
+            if isinstance(text, Exception):
+                # Full HTML can be megabytes — strip it off the event loop.
+                # re holds the GIL, so big pages go to a separate process.
                 content = await page.content()
-                text = re.sub(r'<[^>]+>', ' ', content)
-                text = re.sub(r'\s+', ' ', text)
-            text = re.sub(r'\n{3,}', '\n\n', text).strip()
-            result["text"] = text[:8000] if len(text) > 8000 else text
+                if _cpu_pool is not None and len(content) > CPU_OFFLOAD_CHARS:
+                    loop = asyncio.get_running_loop()
+                    text = await loop.run_in_executor(_cpu_pool, _clean_text, content, True)
+                else:
+                    text = await asyncio.to_thread(_clean_text, content, True)
+            else:
+                text = _clean_text(text)
+            result["text"] = text[:TEXT_LIMIT]
 
         # Click action
         elif req.action == "click" and req.selector:
@@ -211,39 +612,80 @@ async def _browse(req: BrowseRequest) -> dict:
             await page.wait_for_timeout(500)
             result["text"] = f"Filled '{req.selector}' with: {req.input_text[:50]}"
 
-        await context.close()
-        _stats["requests_ok"] += 1
-        return result
+        _stats[_OK] += 1
+        return result, navigated
 
-    except HTTPException:
-        raise
     except Exception as e:
-        _stats["requests_error"] += 1
-        if page:
-            try:
-                await page.close()
-            except Exception:
-                pass
+        healthy = False
+        _stats[_ERROR] += 1
         log.error(f"Browse error for {req.url}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+    finally:
+        await _release_page(slot, healthy)
+
+
+B64_CHUNK = 3 * 16384   # Multiple of 3 so chunks encode without padding
+
+
+def _json_response(result: dict) -> Response:
+    """JSON body with the raw screenshot base64-encoded chunk by chunk.
+
+    Avoids materializing the full base64 str and a second serialized copy
+    of it; only one chunk of encoded output exists at a time.
+    """
+    image = result.pop("screenshot", None)
+    if image is None:
+        return ORJSONResponse(result)
+    meta = orjson.dumps(result)
+
+    def body():
+        yield meta[:-1] + b',"screenshot":"'
+        view = memoryview(image)
+        for i in range(0, len(view), B64_CHUNK):
+            yield _b64encode(view[i:i + B64_CHUNK])
+        yield b'"}'
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def _multipart_response(result: dict, media_type: str) -> StreamingResponse:
+    """multipart/mixed body: JSON metadata part followed by the raw image part."""
+    boundary = uuid.uuid4().hex
+    image = result.pop("screenshot", None)
+    meta = orjson.dumps(result)
+
+    def parts():
+        yield f"--{boundary}\r\nContent-Type: application/json\r\n\r\n".encode("ascii")
+        yield meta
+        if image is not None:
+            yield f"\r\n--{boundary}\r\nContent-Type: {media_type}\r\n\r\n".encode("ascii")
+            yield image
+        yield f"\r\n--{boundary}--\r\n".encode("ascii")
+
+    return StreamingResponse(parts(), media_type=f"multipart/mixed; boundary={boundary}")
+
+
+def _image_media_type(req: BrowseRequest) -> str:
+    return "image/png" if req.img_format == "png" else "image/jpeg"
+
 
 # ── Endpoints ──────────────────────────────────────────────────────────────────
 @app.get("/healthz")
 async def healthz():
     """Always returns 200 immediately — browser may still be warming up."""
-    return {"ok": True, "browser_ready": _browser is not None and _browser.is_connected()}
+    return {"ok": True, "browser_ready": _browser_ready}
 
 
 @app.get("/status")
 async def status(x_api_key: Optional[str] = Header(None)):
     _check_auth(x_api_key)
-    browser_ok = _browser is not None and _browser.is_connected()
-    uptime = int(time.time() - _stats["started_at"])
+    uptime = int(time.time() - _started_at)
     return {
-        "browser_active": browser_ok,
+        "browser_active": _browser_ready,
         "uptime_seconds": uptime,
-        **_stats,
+        **dict(zip(_STAT_NAMES, _stats)),
+        "started_at": _started_at,
     }
 
 
@@ -258,7 +700,11 @@ async def browse(req: BrowseRequest, x_api_key: Optional[str] = Header(None)):
         "action": "read",        // "read" | "screenshot" | "click" | "fill"
         "wait_ms": 1500,         // extra wait after load
         "timeout_ms": 20000,     // navigation timeout
-        "full_page": false       // full page screenshot?
+        "full_page": false,      // full page screenshot?
+        "img_format": "jpeg",    // "jpeg" | "png"
+        "img_quality": 80,       // JPEG quality
+        "no_cache": false,       // bypass the short-lived result cache
+        "response_format": "base64"  // "base64" | "binary" (multipart/mixed)
       }
     
     Response:
@@ -266,27 +712,43 @@ async def browse(req: BrowseRequest, x_api_key: Optional[str] = Header(None)):
         "url": "...",
         "title": "...",
         "text": "...",           // page text (action=read)
-        "screenshot": "base64",  // PNG screenshot
+        "screenshot": "base64",  // JPEG screenshot (img_format="png" for PNG)
         "action": "read"
       }
+
+    With response_format="binary" the response is multipart/mixed: a JSON part
+    with the fields above (minus "screenshot") followed by the raw image part.
     """
     _check_auth(x_api_key)
     log.info(f"📖 Browse: {req.url} (action={req.action})")
-    return await _browse(req)
+    result = await _browse(req, want_shot=True, want_text=req.action == "read")
+    if req.response_format == "binary":
+        return _multipart_response(result, _image_media_type(req))
+    return _json_response(result)
 
 
 @app.post("/screenshot")
 async def screenshot_only(req: BrowseRequest, x_api_key: Optional[str] = Header(None)):
-    """Navigate URL and return only the screenshot (faster, no text extraction)."""
+    """Navigate URL and return only the screenshot (faster, no text extraction).
+
+    With response_format="binary" the raw image is returned (image/jpeg or image/png) and the
+    page title goes in the X-Page-Title header (URL-encoded).
+    """
     _check_auth(x_api_key)
     req.action = "screenshot"
     log.info(f"📸 Screenshot: {req.url}")
-    result = await _browse(req)
-    return {
+    result = await _browse(req, want_shot=True, want_text=False)
+    if req.response_format == "binary":
+        return Response(
+            content=result.get("screenshot", b""),
+            media_type=_image_media_type(req),
+            headers={"X-Page-Title": quote(result["title"])},
+        )
+    return _json_response({
         "url": result["url"],
         "title": result["title"],
-        "screenshot": result.get("screenshot", ""),
-    }
+        "screenshot": result.get("screenshot", b""),
+    })
 
 
 @app.post("/extract")
@@ -295,7 +757,7 @@ async def extract_text(req: BrowseRequest, x_api_key: Optional[str] = Header(Non
     _check_auth(x_api_key)
     req.action = "read"
     log.info(f"📄 Extract: {req.url}")
-    result = await _browse(req)
+    result = await _browse(req, want_shot=False, want_text=True)
     return {
         "url": result["url"],
         "title": result["title"],
@@ -316,4 +778,12 @@ async def restart_browser(x_api_key: Optional[str] = Header(None)):
 # ── Entry point ────────────────────────────────────────────────────────────────
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=PORT)
+    workers = int(os.environ.get("WEB_CONCURRENCY", 1))
+    uvicorn.run(
+        "app:app" if workers > 1 else app,   # multiple workers need an import string
+        host="0.0.0.0",
+        port=PORT,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+    )